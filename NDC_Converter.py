@@ -1,13 +1,73 @@
+import argparse
+import contextlib
+import io
+import itertools
+import numpy as np
 import pandas as pd
+import os
 import re
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import ndc_ext
+except ImportError:  # The Cython kernels are optional; build them with `python setup.py build_ext --inplace`
+    ndc_ext = None
+
+try:
+    import pyarrow
+except ImportError:  # PyArrow is optional; text columns use regular pandas strings without it
+    pyarrow = None
+
+try:
+    import python_calamine
+except ImportError:  # calamine is optional; Excel files are read with openpyxl without it
+    python_calamine = None
+
+# Only ASCII 0-9 count as digits, so the scalar, pandas and Polars paths treat other scripts alike
+_NON_DIGIT = re.compile(r'[^0-9]')
+
+# Text dtype for CSV columns; Arrow-backed strings run .str methods in Arrow's C++ kernels
+_TEXT_DTYPE = 'string[pyarrow]' if pyarrow is not None else str
+
+# Distinct NDCs remembered by the scalar converters; typed so 1 and 1.0 stay separate
+_SCALAR_CACHE_SIZE = 131072
+
+# Rows per chunk when streaming CSV files
+_CSV_CHUNK_SIZE = 100_000
+
+# Character code of '0', for comparisons against character matrices
+_ZERO = ord('0')
+
+# Translation table that deletes every character in the Latin-1 range except 0-9
+_KEEP_DIGITS = str.maketrans('', '', ''.join(chr(c) for c in range(256) if chr(c) not in '0123456789'))
+
+def _strip_non_digits(ndc):
+    """
+    Remove non-digit characters from an NDC, using the regex only for unusual input
+    """
+    ndc = ndc if isinstance(ndc, str) else str(ndc)
+
+    # Clean input (the usual case) needs no stripping at all
+    if ndc.isascii() and ndc.isdigit():
+        return ndc
+
+    # Only 0-9 are left in the ASCII range after the table
+    ndc_digits = ndc.translate(_KEEP_DIGITS)
+    if ndc_digits.isascii():
+        return ndc_digits
+
+    # Characters outside Latin-1 survive the table, so let the regex handle them
+    return _NON_DIGIT.sub('', ndc_digits)
+
 def detect_11_digit_format(ndc):
     """
     Detect the format of an 11-digit NDC by finding where the zero was added
     """
-    ndc_digits = re.sub(r'\D', '', str(ndc))
+    ndc_digits = _strip_non_digits(ndc)
 
     if len(ndc_digits) != 11:
         return None, ndc_digits    # Check if first digit is 0 (likely 4-4-2 format)
@@ -30,7 +90,7 @@ def detect_10_digit_format(ndc):
     Detect the format of a 10-digit NDC (4-4-2, 5-3-2, or 5-4-1)
     """
     # Remove any non-digit characters
-    ndc_digits = re.sub(r'\D', '', str(ndc))
+    ndc_digits = _strip_non_digits(ndc)
 
     # Check if it's already 11 digits
     if len(ndc_digits) == 11:
@@ -60,112 +120,667 @@ def detect_10_digit_format(ndc):
     # Default to 5-3-2 format (most common)
     return '5-3-2', ndc_digits
 
+@lru_cache(maxsize=_SCALAR_CACHE_SIZE, typed=True)
 def convert_10_to_11(ndc):
     """
     Convert a 10-digit NDC to 11-digit format
     """
-    format_type, ndc_digits = detect_10_digit_format(ndc)
+    # Strip, detect and convert in one pass (same rules as detect_10_digit_format)
+    ndc_digits = _strip_non_digits(ndc)
 
-    if format_type is None:
+    if len(ndc_digits) != 10:
         return ndc  # Return as-is if already 11 digits or invalid
 
-    if format_type == '4-4-2':
-        # Add 0 at the beginning
-        return '0' + ndc_digits
-    elif format_type == '5-3-2':
-        # Add 0 at position 6 (index 5)
-        return ndc_digits[:5] + '0' + ndc_digits[5:]
-    elif format_type == '5-4-1':
-        # Add 0 at position 10 (index 9)
-        return ndc_digits[:9] + '0' + ndc_digits[9:]
+    if ndc_digits[0] in '0123':
+        # 4-4-2: add 0 at the beginning
+        return f'0{ndc_digits}'
+    elif int(ndc_digits[5:9]) < 9999:
+        # 5-4-1: add 0 at position 10 (index 9)
+        return f'{ndc_digits[:9]}0{ndc_digits[9:]}'
 
-    return ndc_digits
+    # 5-3-2: add 0 at position 6 (index 5)
+    return f'{ndc_digits[:5]}0{ndc_digits[5:]}'
 
+@lru_cache(maxsize=_SCALAR_CACHE_SIZE, typed=True)
 def convert_11_to_10(ndc):
     """
     Convert an 11-digit NDC to 10-digit format by removing the added zero
     """
-    format_type, ndc_digits = detect_11_digit_format(ndc)
+    # Strip, detect and convert in one pass (same rules as detect_11_digit_format)
+    ndc_digits = _strip_non_digits(ndc)
 
-    if format_type is None:
+    if len(ndc_digits) != 11:
         return ndc  # Return as-is if not 11 digits
 
-    if format_type == '4-4-2':
-        # Remove the first digit (0)
+    if ndc_digits[0] == '0' and ndc_digits[1] != '0':
+        # 4-4-2: remove the first digit (0)
         return ndc_digits[1:]
-    elif format_type == '5-3-2':
-        # Remove the 6th digit (0)
+    elif ndc_digits[5] == '0' and ndc_digits[6] != '0':
+        # 5-3-2: remove the 6th digit (0)
         return ndc_digits[:5] + ndc_digits[6:]
-    elif format_type == '5-4-1':
-        # Remove the 10th digit (0)
+    elif ndc_digits[9] == '0' and ndc_digits[10] != '0':
+        # 5-4-1: remove the 10th digit (0)
         return ndc_digits[:9] + ndc_digits[10:]
-    elif format_type == 'unknown':
-        # Can't determine format, return with warning
-        print(f"Warning: Could not determine format for NDC {ndc_digits}")
-        return ndc_digits
 
+    # Can't determine format, return with warning
+    print(f"Warning: Could not determine format for NDC {ndc_digits}")
     return ndc_digits
 
-def process_file(input_file, ndc_column, conversion_type, output_file=None):
+def _as_text(ndcs):
+    """
+    Return NDCs as strings, leaving string-dtype Series (e.g. Arrow-backed) untouched
+    """
+    if isinstance(ndcs.dtype, pd.StringDtype):
+        return ndcs
+    return ndcs.astype(str)
+
+def _to_char_matrix(ndc_digits, width):
+    """
+    View equal-length digit strings as an (N, width) array of character codes
+    """
+    return ndc_digits.to_numpy(dtype=f'U{width}').view(np.uint32).reshape(-1, width)
+
+def _from_char_matrix(chars):
+    """
+    Turn an (N, width) array of character codes back into an array of strings
+    """
+    return np.ascontiguousarray(chars).view(f'U{chars.shape[1]}').ravel().astype(object)
+
+# Source position of each output character for a 10 -> 11 digit conversion,
+# one row per format (4-4-2, 5-3-2, 5-4-1); -1 marks the inserted zero
+_INSERT_ZERO_INDEX = np.array([
+    [-1, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9],
+    [0, 1, 2, 3, 4, -1, 5, 6, 7, 8, 9],
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, -1, 9],
+])
+
+# Source position of each output character for an 11 -> 10 digit conversion,
+# one row per format (4-4-2, 5-3-2, 5-4-1)
+_REMOVE_ZERO_INDEX = np.array([
+    [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
+    [0, 1, 2, 3, 4, 6, 7, 8, 9, 10],
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 10],
+])
+
+# Numba is imported on first use by _numba_kernels
+numba = None
+
+# Rows a process converts with NumPy before loading Numba; beyond this, its import and
+# JIT start-up (about 0.4s once its cache is warm) cost less than the NumPy time it saves
+_NUMBA_LOAD_ROWS = 2_000_000
+
+# Rows converted with NumPy so far in this process
+_numpy_rows = 0
+
+# Compiled (insert, remove) kernels; None until first use, False if Numba isn't installed
+_jit_kernels = None
+
+def _insert_zero_kernel(chars, is_442, is_541, out):
+    """
+    Copy each 10-digit row into out with the zero inserted (compiled by _numba_kernels)
+    """
+    for i in numba.prange(chars.shape[0]):
+        if is_442[i]:
+            pos = 0
+        elif is_541[i]:
+            pos = 9
+        else:
+            pos = 5
+        for j in range(pos):
+            out[i, j] = chars[i, j]
+        out[i, pos] = _ZERO
+        for j in range(pos, 10):
+            out[i, j + 1] = chars[i, j]
+
+def _remove_zero_kernel(chars, is_442, is_532, out):
+    """
+    Copy each 11-digit row into out with the added zero skipped (compiled by _numba_kernels)
+    """
+    for i in numba.prange(chars.shape[0]):
+        if is_442[i]:
+            pos = 0
+        elif is_532[i]:
+            pos = 5
+        else:
+            pos = 9
+        for j in range(pos):
+            out[i, j] = chars[i, j]
+        for j in range(pos, 10):
+            out[i, j] = chars[i, j + 1]
+
+def _numba_kernels(rows):
+    """
+    Return the compiled (insert, remove) kernels for the next rows to convert,
+    or None while this process hasn't converted enough rows for Numba to pay
+    off, or when Numba isn't installed
+    """
+    global numba, _jit_kernels, _numpy_rows
+
+    # Numba's default workqueue threading layer hangs the interpreter at exit when kernels
+    # run from other threads; Dask's threaded partitions are converted in parallel already
+    if threading.current_thread() is not threading.main_thread():
+        return None
+
+    if _jit_kernels is None:
+        # CSV files are converted a chunk at a time, so count the work across calls
+        _numpy_rows += rows
+        if _numpy_rows < _NUMBA_LOAD_ROWS:
+            return None
+        try:
+            import numba
+        except ImportError:  # Numba is optional; the NumPy path is used without it
+            _jit_kernels = False
+        else:
+            jit = numba.njit(parallel=True, cache=True)
+            _jit_kernels = (jit(_insert_zero_kernel), jit(_remove_zero_kernel))
+    return _jit_kernels or None
+
+def _insert_zero(chars, is_442, is_541):
+    """
+    Build the (N, 11) character matrix for 10-digit rows, adding the zero
+    where each row's format needs it (5-3-2 when neither mask is set)
+    """
+    kernels = _numba_kernels(len(chars))
+    if kernels is not None:
+        out = np.empty((len(chars), 11), dtype=chars.dtype)
+        kernels[0](chars, is_442, is_541, out)
+        return out
+
+    index = _INSERT_ZERO_INDEX[np.where(is_442, 0, np.where(is_541, 2, 1))]
+    return np.where(index == -1, _ZERO, np.take_along_axis(chars, index, axis=1)).astype(chars.dtype)
+
+def _remove_zero(chars, is_442, is_532):
+    """
+    Build the (N, 10) character matrix for 11-digit rows, dropping the zero
+    for each row's format (5-4-1 when neither mask is set)
+    """
+    kernels = _numba_kernels(len(chars))
+    if kernels is not None:
+        out = np.empty((len(chars), 10), dtype=chars.dtype)
+        kernels[1](chars, is_442, is_532, out)
+        return out
+
+    index = _REMOVE_ZERO_INDEX[np.where(is_442, 0, np.where(is_532, 1, 2))]
+    return np.take_along_axis(chars, index, axis=1)
+
+if ndc_ext is not None:
+    def _insert_zero(chars, is_442, is_541):
+        """
+        Cython version of _insert_zero, run in parallel over rows without the GIL
+        """
+        out = np.empty((len(chars), 11), dtype=np.uint32)
+        ndc_ext.insert_zero(chars, is_442.view(np.uint8), is_541.view(np.uint8), out)
+        return out
+
+    def _remove_zero(chars, is_442, is_532):
+        """
+        Cython version of _remove_zero, run in parallel over rows without the GIL
+        """
+        out = np.empty((len(chars), 10), dtype=np.uint32)
+        ndc_ext.remove_zero(chars, is_442.view(np.uint8), is_532.view(np.uint8), out)
+        return out
+
+def convert_10_to_11_series(ndcs):
+    """
+    Convert a Series of 10-digit NDCs to 11-digit format in one vectorized pass
+    """
+    ndc_digits = _as_text(ndcs).str.replace(_NON_DIGIT.pattern, '', regex=True)
+    is_10_digit = ndc_digits.str.len().eq(10).to_numpy(dtype=bool, na_value=False)
+    chars = _to_char_matrix(ndc_digits[is_10_digit], 10)
+
+    # Same heuristics as detect_10_digit_format, evaluated for the whole column
+    is_442 = (chars[:, 0] >= _ZERO) & (chars[:, 0] <= _ZERO + 3)
+    is_541 = ~(chars[:, 5:9] == _ZERO + 9).all(axis=1)
+
+    out = _insert_zero(chars, is_442, is_541)
+
+    # Leave anything that isn't 10 digits as-is
+    converted = ndcs.astype(object)
+    converted[is_10_digit] = _from_char_matrix(out)
+    return converted
+
+def convert_11_to_10_series(ndcs):
+    """
+    Convert a Series of 11-digit NDCs to 10-digit format in one vectorized pass
+    """
+    ndc_digits = _as_text(ndcs).str.replace(_NON_DIGIT.pattern, '', regex=True)
+    is_11_digit = ndc_digits.str.len().eq(11).to_numpy(dtype=bool, na_value=False)
+    chars = _to_char_matrix(ndc_digits[is_11_digit], 11)
+
+    # Same zero-placement checks as detect_11_digit_format
+    is_442 = (chars[:, 0] == _ZERO) & (chars[:, 1] != _ZERO)
+    is_532 = (chars[:, 5] == _ZERO) & (chars[:, 6] != _ZERO)
+    is_541 = (chars[:, 9] == _ZERO) & (chars[:, 10] != _ZERO)
+    is_known = is_442 | is_532 | is_541
+
+    out = _remove_zero(chars, is_442, is_532)
+
+    # Unknown formats keep all 11 digits, with a warning
+    digits = ndc_digits[is_11_digit].to_numpy(dtype=object)
+    for unknown in digits[~is_known]:
+        print(f"Warning: Could not determine format for NDC {unknown}")
+    digits[is_known] = _from_char_matrix(out[is_known])
+
+    # Leave anything that isn't 11 digits as-is
+    converted = ndcs.astype(object)
+    converted[is_11_digit] = digits
+    return converted
+
+def _read_excel(input_file, **kwargs):
+    """
+    Read an Excel file, using the Rust-based calamine reader when it's installed
+    """
+    if python_calamine is not None:
+        kwargs.setdefault('engine', 'calamine')
+    return pd.read_excel(input_file, **kwargs)
+
+def _converted_column_name(ndc_column, conversion_type):
+    """
+    Name of the column that holds the converted NDCs
+    """
+    if conversion_type == '10to11':
+        return f"{ndc_column}_11digit"
+    return f"{ndc_column}_10digit"
+
+def _convert_column(ndcs, conversion_type):
+    """
+    Convert a Series of NDCs in the requested direction
+
+    Each distinct NDC is converted once and mapped back onto the rows, since
+    real files repeat the same codes many times.
+    """
+    codes, uniques = pd.factorize(ndcs, use_na_sentinel=False)
+    uniques = pd.Series(uniques)
+    if conversion_type == '10to11':
+        converted = convert_10_to_11_series(uniques)
+    else:
+        converted = convert_11_to_10_series(uniques)
+    return pd.Series(converted.to_numpy(dtype=object)[codes], index=ndcs.index)
+
+def _print_summary(total_rows, conversion_type, ndc_column, converted_column, sample_df):
+    """
+    Print the conversion summary and a few sample conversions
+    """
+    print(f"\nConversion Summary:")
+    print(f"Total rows processed: {total_rows}")
+    print(f"Conversion type: {conversion_type}")
+    print(f"Original NDC column: {ndc_column}")
+    print(f"Converted NDC column: {converted_column}")
+
+    # Show sample conversions
+    print(f"\nSample conversions (first 5):")
+    for original, converted in zip(sample_df[ndc_column].to_numpy(), sample_df[converted_column].to_numpy()):
+        print(f"  {original} → {converted}")
+
+def _process_csv_with_dask(input_file, ndc_column, conversion_type, output_file, usecols=None):
+    """
+    Convert a CSV file partition by partition with Dask, streaming it to disk
+    """
+    try:
+        import dask
+        import dask.dataframe as dd
+    except ImportError:
+        print("Error: The dask engine requires dask (pip install \"dask[dataframe]\").")
+        return
+
+    converted_column = _converted_column_name(ndc_column, conversion_type)
+
+    def _convert_partition(pdf):
+        pdf[converted_column] = _convert_column(pdf[ndc_column], conversion_type)
+        return pdf
+
+    try:
+        # Read every field as text so partitions agree on dtypes and passthrough columns round-trip
+        ddf = dd.read_csv(input_file, dtype=_TEXT_DTYPE, usecols=usecols, blocksize='64MB')
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return
+
+    if ndc_column not in ddf.columns:
+        print(f"Error: Column '{ndc_column}' not found in the file.")
+        print(f"Available columns: {', '.join(ddf.columns)}")
+        return
+
+    converted = ddf.map_partitions(_convert_partition)
+
+    try:
+        # Write, count and sample in one pass over the file
+        write = converted.to_csv(output_file, single_file=True, index=False, compute=False)
+        partitions = converted.to_delayed()
+        row_count = dask.delayed(sum)([dask.delayed(len)(part) for part in partitions])
+        _, total_rows, first_partition = dask.compute(write, row_count, partitions[0])
+        print(f"Successfully converted NDCs and saved to: {output_file}")
+        sample_df = first_partition[[ndc_column, converted_column]].head()
+        _print_summary(total_rows, conversion_type, ndc_column, converted_column, sample_df)
+        return output_file
+
+    except Exception as e:
+        print(f"Error saving file: {e}")
+
+def _polars_conversion(ndc_column, conversion_type):
+    """
+    Build Polars expressions for the converted NDC column and, for 11to10,
+    the rows whose format can't be determined
+    """
+    import polars as pl
+
+    ndc = pl.col(ndc_column)
+    digits = ndc.str.replace_all(_NON_DIGIT.pattern, '')
+    length = digits.str.len_chars()
+
+    def digit(i):
+        return digits.str.slice(i, 1)
+
+    if conversion_type == '10to11':
+        converted = (
+            pl.when(length != 10).then(ndc)
+            .when(digit(0).is_in(['0', '1', '2', '3'])).then(pl.concat_str([pl.lit('0'), digits]))
+            .when(digits.str.slice(5, 4) != '9999')
+            .then(pl.concat_str([digits.str.slice(0, 9), pl.lit('0'), digits.str.slice(9)]))
+            .otherwise(pl.concat_str([digits.str.slice(0, 5), pl.lit('0'), digits.str.slice(5)]))
+        )
+        return converted, None
+
+    is_442 = (digit(0) == '0') & (digit(1) != '0')
+    is_532 = (digit(5) == '0') & (digit(6) != '0')
+    is_541 = (digit(9) == '0') & (digit(10) != '0')
+    converted = (
+        pl.when(length != 11).then(ndc)
+        .when(is_442).then(digits.str.slice(1))
+        .when(is_532).then(pl.concat_str([digits.str.slice(0, 5), digits.str.slice(6)]))
+        .when(is_541).then(pl.concat_str([digits.str.slice(0, 9), digits.str.slice(10)]))
+        .otherwise(digits)
+    )
+    is_unknown = (length == 11) & ~(is_442 | is_532 | is_541)
+    return converted, is_unknown
+
+def _process_csv_with_polars(input_file, ndc_column, conversion_type, output_file, usecols=None):
+    """
+    Convert a CSV file with a Polars lazy query, streaming it to disk
+    """
+    try:
+        import polars as pl
+    except ImportError:
+        print("Error: The polars engine requires polars (pip install polars).")
+        return
+
+    converted_column = _converted_column_name(ndc_column, conversion_type)
+
+    try:
+        # Read every field as text, matching the pandas CSV path
+        lf = pl.scan_csv(input_file, infer_schema_length=0)
+        columns = lf.collect_schema().names()
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return
+
+    if ndc_column not in columns:
+        print(f"Error: Column '{ndc_column}' not found in the file.")
+        print(f"Available columns: {', '.join(columns)}")
+        return
+
+    if usecols is not None:
+        lf = lf.select(usecols)
+
+    converted, is_unknown = _polars_conversion(ndc_column, conversion_type)
+    new_columns = [converted.alias(converted_column)]
+    stats = [pl.len().alias('rows')]
+    if is_unknown is not None:
+        # Flag unknown rows next to the conversion so both share its work; they keep their digits
+        unknown_flag = '__ndc_unknown__'
+        new_columns.append(is_unknown.alias(unknown_flag))
+        stats.append(pl.col(converted_column).filter(pl.col(unknown_flag)).implode().alias('unknown'))
+        lf = lf.with_columns(new_columns)
+        written = lf.drop(unknown_flag)
+    else:
+        lf = written = lf.with_columns(new_columns)
+
+    try:
+        # Run the write and the summary as one query so the input is only scanned once
+        _, summary, sample_df = pl.collect_all([
+            written.sink_csv(output_file, lazy=True),
+            lf.select(stats),
+            lf.select(ndc_column, converted_column).head(),
+        ])
+        summary = summary.row(0, named=True)
+
+        for ndc_digits in summary.get('unknown', []):
+            print(f"Warning: Could not determine format for NDC {ndc_digits}")
+        print(f"Successfully converted NDCs and saved to: {output_file}")
+
+        # Show summary
+        _print_summary(summary['rows'], conversion_type, ndc_column, converted_column, sample_df)
+        return output_file
+
+    except Exception as e:
+        print(f"Error saving file: {e}")
+
+def _write_csv_chunks(chunks, output_file):
+    """
+    Write DataFrame chunks of text columns to one CSV file and return the row
+    count, using PyArrow's multithreaded writer when it's installed
+    """
+    total_rows = 0
+
+    if pyarrow is None:
+        with open(output_file, 'w', newline='', encoding='utf-8') as out:
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(out, header=(i == 0), index=False)
+                total_rows += len(chunk)
+        return total_rows
+
+    from pyarrow import csv as pyarrow_csv
+
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                # Every column is text; a fixed schema keeps all-null chunks from inferring another type
+                schema = pyarrow.schema([(column, pyarrow.string()) for column in chunk.columns])
+                writer = pyarrow_csv.CSVWriter(output_file, schema)
+            writer.write_table(pyarrow.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            total_rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return total_rows
+
+def _process_csv_in_chunks(input_file, ndc_column, conversion_type, output_file, usecols=None):
+    """
+    Convert a CSV file one chunk at a time, appending each chunk to the output
+    """
+    converted_column = _converted_column_name(ndc_column, conversion_type)
+
+    try:
+        # Keep every field as text so chunks don't infer different dtypes
+        chunks = pd.read_csv(input_file, chunksize=_CSV_CHUNK_SIZE, dtype=_TEXT_DTYPE, usecols=usecols)
+        first_chunk = next(chunks)
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return
+
+    # Check if column exists
+    if ndc_column not in first_chunk.columns:
+        print(f"Error: Column '{ndc_column}' not found in the file.")
+        print(f"Available columns: {', '.join(first_chunk.columns)}")
+        return
+
+    def converted_chunks():
+        for chunk in itertools.chain([first_chunk], chunks):
+            chunk[converted_column] = _convert_column(chunk[ndc_column], conversion_type)
+            yield chunk
+
+    # Convert and save the result
+    try:
+        total_rows = _write_csv_chunks(converted_chunks(), output_file)
+        print(f"Successfully converted NDCs and saved to: {output_file}")
+
+        # Show summary
+        sample_df = first_chunk[[ndc_column, converted_column]].head()
+        _print_summary(total_rows, conversion_type, ndc_column, converted_column, sample_df)
+        return output_file
+
+    except Exception as e:
+        print(f"Error saving file: {e}")
+
+def _default_output_file(input_path):
+    """
+    Output filename used when none is given: <stem>_converted<suffix> in the working directory
+    """
+    return input_path.stem + "_converted" + input_path.suffix
+
+def process_file(input_file, ndc_column, conversion_type, output_file=None, engine='pandas', fast_write=False,
+                 ndc_only=False):
     """
     Process a CSV/Excel file and convert NDCs in the specified column
+
+    CSV files are streamed in chunks, in parallel partitions with
+    engine='dask', or as a lazy query with engine='polars'; Excel files
+    are loaded whole, and with fast_write=True are saved as Parquet
+    instead of Excel. With ndc_only=True only the NDC column is read, and
+    the output holds just the original and converted NDCs. Returns the
+    output filename, or None on error.
     """
     # Determine file type and read accordingly
-    file_ext = Path(input_file).suffix.lower()
+    input_path = Path(input_file)
+    file_ext = input_path.suffix.lower()
+
+    # Create output filename if not specified
+    if output_file is None:
+        output_file = _default_output_file(input_path)
+
+    # Skip parsing every other column when only the NDCs are wanted
+    usecols = None
+    if ndc_only and file_ext == '.csv':
+        # Check the header first; CSV readers given a missing usecols fail without listing the columns
+        try:
+            header = pd.read_csv(input_file, nrows=0)
+        except Exception as e:
+            print(f"Error reading file: {e}")
+            return
+
+        if ndc_column not in header.columns:
+            print(f"Error: Column '{ndc_column}' not found in the file.")
+            print(f"Available columns: {', '.join(header.columns)}")
+            return
+        usecols = [ndc_column]
+
+    if file_ext == '.csv':
+        if engine == 'dask':
+            return _process_csv_with_dask(input_file, ndc_column, conversion_type, output_file, usecols)
+        if engine == 'polars':
+            return _process_csv_with_polars(input_file, ndc_column, conversion_type, output_file, usecols)
+        return _process_csv_in_chunks(input_file, ndc_column, conversion_type, output_file, usecols)
+
+    # Every column name in an Excel header, recorded while reading only the NDC column
+    excel_columns = []
+
+    def is_ndc_column(column):
+        excel_columns.append(column)
+        return column == ndc_column
 
     try:
-        if file_ext == '.csv':
-            df = pd.read_csv(input_file)
-        elif file_ext in ['.xlsx', '.xls']:
-            df = pd.read_excel(input_file)
+        if file_ext in ['.xlsx', '.xls']:
+            # Read NDCs as text so numeric cells aren't inferred as numbers
+            df = _read_excel(
+                input_file, usecols=is_ndc_column if ndc_only else None, dtype={ndc_column: _TEXT_DTYPE}
+            )
         else:
             raise ValueError(f"Unsupported file type: {file_ext}")
     except Exception as e:
         print(f"Error reading file: {e}")
         return
 
+    if engine != 'pandas':
+        print(f"Note: The {engine} engine only supports CSV files; using pandas instead.")
+
     # Check if column exists
     if ndc_column not in df.columns:
         print(f"Error: Column '{ndc_column}' not found in the file.")
-        print(f"Available columns: {', '.join(df.columns)}")
+        print(f"Available columns: {', '.join(map(str, excel_columns or df.columns))}")
         return
 
     # Create a new column for converted NDCs
-    if conversion_type == '10to11':
-        converted_column = f"{ndc_column}_11digit"
-        df[converted_column] = df[ndc_column].apply(convert_10_to_11)
-    else:  # 11to10
-        converted_column = f"{ndc_column}_10digit"
-        df[converted_column] = df[ndc_column].apply(convert_11_to_10)
+    converted_column = _converted_column_name(ndc_column, conversion_type)
+    df[converted_column] = _convert_column(df[ndc_column], conversion_type)
 
-    # Create output filename if not specified
-    if output_file is None:
-        output_file = Path(input_file).stem + "_converted" + Path(input_file).suffix
+    # Writing Excel is slow, so fast_write saves a Parquet file instead
+    if fast_write and pyarrow is None:
+        print("Note: --fast-write requires pyarrow; saving as Excel instead.")
+    elif fast_write:
+        output_file = str(Path(output_file).with_suffix('.parquet'))
 
     # Save the result
     try:
-        if file_ext == '.csv':
-            df.to_csv(output_file, index=False)
+        if Path(output_file).suffix.lower() == '.parquet':
+            # Parquet needs one type per column, so save mixed columns (e.g. numbers and text) as text
+            mixed_columns = [column for column, dtype in df.dtypes.items() if dtype == object]
+            df.astype(dict.fromkeys(mixed_columns, _TEXT_DTYPE)).to_parquet(
+                output_file, engine='pyarrow', compression='zstd', index=False
+            )
         else:
             df.to_excel(output_file, index=False)
         print(f"Successfully converted NDCs and saved to: {output_file}")
 
         # Show summary
-        print(f"\nConversion Summary:")
-        print(f"Total rows processed: {len(df)}")
-        print(f"Conversion type: {conversion_type}")
-        print(f"Original NDC column: {ndc_column}")
-        print(f"Converted NDC column: {converted_column}")
-
-        # Show sample conversions
-        print(f"\nSample conversions (first 5):")
         sample_df = df[[ndc_column, converted_column]].head()
-        for idx, row in sample_df.iterrows():
-            print(f"  {row[ndc_column]} → {row[converted_column]}")
+        _print_summary(len(df), conversion_type, ndc_column, converted_column, sample_df)
+        return output_file
 
     except Exception as e:
         print(f"Error saving file: {e}")
 
+def _process_file_quietly(job):
+    """
+    Run process_file in a worker process, returning its output file and printed report
+    """
+    report = io.StringIO()
+    with contextlib.redirect_stdout(report):
+        output_file = process_file(*job)
+    return output_file, report.getvalue()
+
+def _duplicate_output_files(input_files, fast_write=False):
+    """
+    Default output files that more than one of input_files would be saved to
+    """
+    seen, duplicates = set(), []
+    for input_file in input_files:
+        output_path = Path(_default_output_file(Path(input_file)))
+        if fast_write and output_path.suffix.lower() in ['.xlsx', '.xls']:
+            output_path = output_path.with_suffix('.parquet')
+        key = output_path.resolve()
+        if key in seen and str(output_path) not in duplicates:
+            duplicates.append(str(output_path))
+        seen.add(key)
+    return duplicates
+
+def process_files(input_files, ndc_column, conversion_type, engine='pandas', fast_write=False, ndc_only=False):
+    """
+    Process several files in parallel worker processes, each saved to its default output file
+    """
+    # Parallel workers writing the same file would silently lose one result
+    duplicates = _duplicate_output_files(input_files, fast_write)
+    if duplicates:
+        raise ValueError(
+            f"several input files would be saved to the same output file: {', '.join(duplicates)}; "
+            "rename them or convert them in separate runs"
+        )
+
+    jobs = [
+        (input_file, ndc_column, conversion_type, None, engine, fast_write, ndc_only) for input_file in input_files
+    ]
+    with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+        results = list(executor.map(_process_file_quietly, jobs))
+
+    # Print each file's report in order, rather than interleaved as the workers ran
+    for input_file, (output_file, report) in zip(input_files, results):
+        print(f"\n=== {input_file} ===")
+        print(report, end="")
+
+    converted = sum(output_file is not None for output_file, report in results)
+    print(f"\nConverted {converted} of {len(input_files)} files.")
+    return [output_file for output_file, report in results]
+
 def main():
     """
     Main function to handle user input and process the file
@@ -192,17 +807,18 @@ def main():
     # Get input file
     input_file = input("\nEnter the path to your input file (CSV or Excel): ").strip()
 
-    if not Path(input_file).exists():
+    input_path = Path(input_file)
+    if not input_path.exists():
         print(f"Error: File '{input_file}' not found.")
         return
 
     # Show available columns
-    file_ext = Path(input_file).suffix.lower()
+    file_ext = input_path.suffix.lower()
     try:
         if file_ext == '.csv':
             df = pd.read_csv(input_file, nrows=5)
         elif file_ext in ['.xlsx', '.xls']:
-            df = pd.read_excel(input_file, nrows=5)
+            df = _read_excel(input_file, nrows=5)
         else:
             print(f"Error: Unsupported file type '{file_ext}'. Please use CSV or Excel files.")
             return
@@ -240,25 +856,57 @@ def main():
 if __name__ == "__main__":
     # Check if running with command line arguments
     if len(sys.argv) > 1:
-        if len(sys.argv) < 4:
-            print("Usage: python ndc_converter.py <input_file> <ndc_column> <conversion_type> [output_file]")
-            print("  conversion_type: '10to11' or '11to10'")
-            print("\nExample:")
-            print("  python ndc_converter.py medications.csv NDC_Code 10to11")
-            print("  python ndc_converter.py medications.csv NDC_Code 11to10 output.csv")
-            sys.exit(1)
-
-        input_file = sys.argv[1]
-        ndc_column = sys.argv[2]
-        conversion_type = sys.argv[3]
-
-        if conversion_type not in ['10to11', '11to10']:
-            print("Error: conversion_type must be '10to11' or '11to10'")
-            sys.exit(1)
-
-        output_file = sys.argv[4] if len(sys.argv) > 4 else None
-
-        process_file(input_file, ndc_column, conversion_type, output_file)
+        parser = argparse.ArgumentParser(
+            prog="python ndc_converter.py",
+            description="Convert NDCs between 10-digit and 11-digit formats. Run without arguments for interactive mode.",
+            epilog=(
+                "Example:\n"
+                "  python ndc_converter.py medications.csv NDC_Code 10to11\n"
+                "  python ndc_converter.py medications.csv NDC_Code 11to10 output.csv"
+            ),
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+        parser.add_argument("input_file", help="path to a CSV or Excel file")
+        parser.add_argument("ndc_column", help="name of the column containing NDCs")
+        parser.add_argument("conversion_type", choices=['10to11', '11to10'])
+        parser.add_argument("output_file", nargs="?", help="output filename (default: <input>_converted)")
+        parser.add_argument(
+            "--batch", nargs="+", default=[], metavar="FILE",
+            help="more input files to convert with the same column and conversion type, in "
+                 "parallel worker processes; each is saved to its default output file",
+        )
+        parser.add_argument(
+            "--ndc-only", action="store_true",
+            help="read only the NDC column and write just the original and converted NDCs, "
+                 "skipping the other columns",
+        )
+        parser.add_argument(
+            "--fast-write", action="store_true",
+            help="save Excel input as a Parquet file (<output>.parquet) instead of Excel, "
+                 "which is much faster to write; requires pyarrow",
+        )
+        parser.add_argument(
+            "--engine", choices=['pandas', 'dask', 'polars'], default='pandas',
+            help="'dask' converts large CSV files in parallel partitions, 'polars' as a "
+                 "streaming query (default: pandas)",
+        )
+        args = parser.parse_args()
+
+        if args.batch:
+            if args.output_file:
+                parser.error("output_file can't be used with --batch; each file gets its default output name")
+            try:
+                process_files(
+                    [args.input_file] + args.batch, args.ndc_column, args.conversion_type, args.engine,
+                    args.fast_write, args.ndc_only,
+                )
+            except ValueError as e:
+                parser.error(str(e))
+        else:
+            process_file(
+                args.input_file, args.ndc_column, args.conversion_type, args.output_file, args.engine, args.fast_write,
+                args.ndc_only,
+            )
     else:
         # Interactive mode
         main()
\ No newline at end of file
@@ -0,0 +1,50 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled NDC conversion kernels for NDC_Converter.py
+
+NDC_Converter uses these in place of its Numba/NumPy versions when the
+extension has been built:
+
+    python setup.py build_ext --inplace
+"""
+from cython.parallel cimport prange
+
+cdef enum:
+    ZERO = 48  # ord('0')
+
+def insert_zero(const unsigned int[:, ::1] chars, const unsigned char[::1] is_442,
+                const unsigned char[::1] is_541, unsigned int[:, ::1] out):
+    """
+    Copy each 10-digit row into out with the zero inserted
+    """
+    cdef Py_ssize_t i, j, pos
+    for i in prange(chars.shape[0], nogil=True):
+        if is_442[i]:
+            pos = 0
+        elif is_541[i]:
+            pos = 9
+        else:
+            pos = 5
+        for j in range(pos):
+            out[i, j] = chars[i, j]
+        out[i, pos] = ZERO
+        for j in range(pos, 10):
+            out[i, j + 1] = chars[i, j]
+
+def remove_zero(const unsigned int[:, ::1] chars, const unsigned char[::1] is_442,
+                const unsigned char[::1] is_532, unsigned int[:, ::1] out):
+    """
+    Copy each 11-digit row into out with the added zero skipped
+    """
+    cdef Py_ssize_t i, j, pos
+    for i in prange(chars.shape[0], nogil=True):
+        if is_442[i]:
+            pos = 0
+        elif is_532[i]:
+            pos = 5
+        else:
+            pos = 9
+        for j in range(pos):
+            out[i, j] = chars[i, j]
+        for j in range(pos, 10):
+            out[i, j] = chars[i, j + 1]
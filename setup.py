@@ -0,0 +1,20 @@
+"""
+Builds the optional ndc_ext Cython kernels next to NDC_Converter.py:
+
+    pip install cython
+    python setup.py build_ext --inplace
+"""
+import sys
+
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+openmp = ['/openmp'] if sys.platform == 'win32' else ['-fopenmp']
+
+setup(
+    name='ndc_ext',
+    ext_modules=cythonize(
+        [Extension('ndc_ext', ['ndc_ext.pyx'], extra_compile_args=openmp, extra_link_args=openmp)],
+        language_level=3,
+    ),
+)